@@ -1,8 +1,10 @@
 """Nakdan Integration for Home Assistant."""
 import logging
-from homeassistant.core import HomeAssistant
+from datetime import datetime, timedelta
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
+from homeassistant.helpers.event import async_track_time_interval
 
 from .const import DOMAIN
 
@@ -14,15 +16,27 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Nakdan from a config entry."""
     hass.data.setdefault(DOMAIN, {})
 
-    # Initialize the singleton API client
-    from .nakdan_api import NakdanAPI
-    api_client = NakdanAPI()
+    # Set the Home Assistant instance on the shared API client
+    from .nakdan_api import api
+    api.set_hass(hass)
 
-    # Set the Home Assistant instance
-    api_client.set_hass(hass)
+    # Restore cached results from the previous run
+    await api.async_load_cache()
 
     _LOGGER.info("Nakdan client initialized")
 
+    # Drop expired cache entries in the background, so requests only look up and insert
+    if api.enable_cache_timeout:
+        @callback
+        def _async_cleanup_expired_cache(now: datetime) -> None:
+            api.cleanup_expired_cache()
+
+        entry.async_on_unload(
+            async_track_time_interval(
+                hass, _async_cleanup_expired_cache, timedelta(seconds=api.cache_duration / 4)
+            )
+        )
+
     # Set up platforms
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
@@ -49,6 +63,11 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     return unload_ok
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the persisted cache when the integration is removed."""
+    from .nakdan_api import api
+    await api.async_remove_cache(hass)
+
 async def async_setup_services(hass: HomeAssistant):
     """Set up services for the Nakdan integration."""
     from .services import async_setup_services as setup_services
@@ -10,37 +10,29 @@ from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
 
-from .const import DOMAIN, DEFAULT_ENABLE_CACHE_TIMEOUT, DEFAULT_CACHE_DURATION, DEFAULT_MAX_CACHE_SIZE
+from .const import DOMAIN, DEFAULT_ENABLE_CACHE_TIMEOUT, DEFAULT_CACHE_DURATION, DEFAULT_MAX_CACHE_SIZE, DEFAULT_ENABLE_BATCHING
 from .nakdan_api import NakdanAPI
 
 _LOGGER = logging.getLogger(__name__)
 
-# STEP_USER_DATA_SCHEMA = vol.Schema(
-#     {
-#         vol.Optional("enable_cache_timeout", default=DEFAULT_ENABLE_CACHE_TIMEOUT): bool,
-#         vol.Optional("cache_duration", default=DEFAULT_CACHE_DURATION): vol.All(
-#             vol.Coerce(int), vol.Range(min=60, max=86400)
-#         ),
-#         vol.Optional("max_cache_size", default=DEFAULT_MAX_CACHE_SIZE): vol.All(
-#             vol.Coerce(int), vol.Range(min=10, max=1000000)
-#         ),
-#     }
-# )
+# Validators are built once and shared by every schema instance
+CACHE_DURATION_VALIDATOR = vol.All(vol.Coerce(int), vol.Range(min=60, max=86400))
+MAX_CACHE_SIZE_VALIDATOR = vol.All(vol.Coerce(int), vol.Range(min=10, max=1000000))
 
 def get_options_schema(config_entry: config_entries.ConfigEntry | None = None) -> vol.Schema:
     """Get the options schema for the config entry."""
     return vol.Schema(
         {
             vol.Optional("enable_cache_timeout", default=config_entry.data.get("enable_cache_timeout", DEFAULT_ENABLE_CACHE_TIMEOUT) if config_entry else DEFAULT_ENABLE_CACHE_TIMEOUT): bool,
-            vol.Optional("cache_duration", default=config_entry.data.get("cache_duration", DEFAULT_CACHE_DURATION) if config_entry else DEFAULT_CACHE_DURATION): vol.All(
-                vol.Coerce(int), vol.Range(min=60, max=86400)
-            ),
-            vol.Optional("max_cache_size", default=config_entry.data.get("max_cache_size", DEFAULT_MAX_CACHE_SIZE) if config_entry else DEFAULT_MAX_CACHE_SIZE): vol.All(
-                vol.Coerce(int), vol.Range(min=10, max=1000000)
-            ),
+            vol.Optional("cache_duration", default=config_entry.data.get("cache_duration", DEFAULT_CACHE_DURATION) if config_entry else DEFAULT_CACHE_DURATION): CACHE_DURATION_VALIDATOR,
+            vol.Optional("max_cache_size", default=config_entry.data.get("max_cache_size", DEFAULT_MAX_CACHE_SIZE) if config_entry else DEFAULT_MAX_CACHE_SIZE): MAX_CACHE_SIZE_VALIDATOR,
+            vol.Optional("enable_batching", default=config_entry.data.get("enable_batching", DEFAULT_ENABLE_BATCHING) if config_entry else DEFAULT_ENABLE_BATCHING): bool,
         }
     )
 
+# The user step always uses the default values, so its schema is built once
+STEP_USER_DATA_SCHEMA = get_options_schema()
+
 
 async def validate_api(hass: HomeAssistant) -> dict[str, Any]:
     """Validate the user input allows us to connect to the service."""
@@ -89,7 +81,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             else:
                 return self.async_create_entry(title=info["title"], data=user_input)
 
-        return self.async_show_form(step_id="user", data_schema=get_options_schema(), errors=errors)
+        return self.async_show_form(step_id="user", data_schema=STEP_USER_DATA_SCHEMA, errors=errors)
 
 
 class OptionsFlowHandler(config_entries.OptionsFlow):
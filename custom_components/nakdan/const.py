@@ -7,6 +7,7 @@ CONF_TIMEOUT = "timeout"
 CONF_ENABLE_CACHE_TIMEOUT = "enable_cache_timeout"
 CONF_CACHE_DURATION = "cache_duration"
 CONF_MAX_CACHE_SIZE = "max_cache_size"
+CONF_ENABLE_BATCHING = "enable_batching"
 
 # Defaults
 DEFAULT_TIMEOUT = 15
@@ -14,6 +15,17 @@ DEFAULT_CACHE_DURATION = 3600  # 1 hour in seconds
 DEFAULT_MAX_CACHE_SIZE = 1000  # Maximum number of cached entries
 DEFAULT_MAX_RETRIES = 1  # Number of retries on failure
 DEFAULT_ENABLE_CACHE_TIMEOUT = False  # Disable cache timeout by default
+DEFAULT_ENABLE_BATCHING = False  # Send each request on its own by default
+
+# Batching
+BATCH_WINDOW = 0.02  # Seconds to collect concurrent requests into one service call
+BATCH_SEPARATOR = "\n"  # Joins batched texts, the service keeps line breaks as separators
+
+# Storage
+STORAGE_KEY = f"{DOMAIN}.cache"
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 60  # Seconds to batch cache writes to disk
+STORAGE_MAX_ENTRIES = 1000  # Most recently used entries kept across restarts
 
 # Limits
 MAX_TEXT_LENGTH = 10000  # Maximum characters allowed in text input
@@ -46,6 +58,7 @@ SERVICE_CLEAR_CACHE = "clear_cache"
 # Attributes
 ATTR_TEXT = "text"
 ATTR_ORIGINAL_TEXT = "original_text"
+ATTR_INCLUDE_ORIGINAL = "include_original"
 ATTR_NIKUD_TEXT = "nikud_text"
 ATTR_RESPONSE_TIME = "response_time"
 ATTR_CACHE_STATS = "cache_stats"
\ No newline at end of file
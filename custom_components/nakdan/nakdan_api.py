@@ -1,19 +1,39 @@
 """Client for Nakdan service."""
 import asyncio
-import hashlib
 import logging
-import threading
 import time
-from typing import Dict, List, Optional, Any
+from collections import OrderedDict, deque
+from functools import partial
+from itertools import islice
+from typing import Dict, List, Optional, Any, Tuple
 import aiohttp
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.json import json_bytes
+from homeassistant.helpers.storage import Store
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util.json import json_loads
 from homeassistant.config_entries import ConfigEntry
-from .const import NAKDAN_API_URL, NAKDAN_API_HEADERS, NAKDAN_API_OPTIONS, GENRES, DEFAULT_TIMEOUT, DEFAULT_ENABLE_CACHE_TIMEOUT, DEFAULT_CACHE_DURATION, DEFAULT_MAX_CACHE_SIZE, DEFAULT_MAX_RETRIES, DOMAIN
+from .const import NAKDAN_API_URL, NAKDAN_API_HEADERS, NAKDAN_API_OPTIONS, GENRES, DEFAULT_TIMEOUT, DEFAULT_ENABLE_CACHE_TIMEOUT, DEFAULT_CACHE_DURATION, DEFAULT_MAX_CACHE_SIZE, DEFAULT_MAX_RETRIES, DEFAULT_ENABLE_BATCHING, BATCH_WINDOW, BATCH_SEPARATOR, DOMAIN, MAX_TEXT_LENGTH, STORAGE_KEY, STORAGE_VERSION, STORAGE_SAVE_DELAY, STORAGE_MAX_ENTRIES
 
 _LOGGER = logging.getLogger(__name__)
 
+# Monotonic clock for cache timestamps and timings, immune to wall-clock adjustments
+_now = time.monotonic
+
+# Request timeout shared by every service call
+_TIMEOUT = aiohttp.ClientTimeout(total=DEFAULT_TIMEOUT)
+
+# Static part of the service payload for each genre, copied and filled in per request
+_PAYLOAD_TEMPLATES = {
+    genre: {
+        "task": "nakdan",
+        "genre": genre,
+        **NAKDAN_API_OPTIONS
+    }
+    for genre in GENRES
+}
+
 class NakdanError(HomeAssistantError):
     """Base exception for Nakdan errors."""
 
@@ -22,33 +42,28 @@ class NakdanInvalidGenreError(NakdanError):
 
 class NakdanAPI:
     """Client for Nakdan service."""
-    _instance = None
-    _lock = threading.Lock()
-
-    def __new__(cls):
-        """Create a new instance of NakdanAPI."""
-        with cls._lock:
-            if not cls._instance:
-                cls._instance = super(NakdanAPI, cls).__new__(cls)
-                cls._instance._hass = None
-                cls._instance._cache = {}
-        return cls._instance
+
+    def __init__(self) -> None:
+        """Initialize the client."""
+        self._hass = None
+        self._session = None
+        self._store = None
+        self._cache = OrderedDict()
+        # (timestamp, cache_key) pairs in insertion order, which is also expiry order
+        self._expiry_queue = deque()
+        self._inflight = {}
+        self._pending = {}
 
     # Check if api is working statically
     @staticmethod
     async def test_api(hass: HomeAssistant) -> bool:
         """Test if the API is working."""
         try:
-            payload = {
-                "task": "nakdan",
-                "data": "שלום",
-                "genre": "modern",
-                **NAKDAN_API_OPTIONS
-            }
+            payload = _PAYLOAD_TEMPLATES["modern"].copy()
+            payload["data"] = "שלום"
 
             session = async_get_clientsession(hass)
-            timeout = aiohttp.ClientTimeout(total=DEFAULT_TIMEOUT)
-            async with session.post(NAKDAN_API_URL, json=payload, headers=NAKDAN_API_HEADERS, timeout=timeout) as response:
+            async with session.post(NAKDAN_API_URL, data=json_bytes(payload), headers=NAKDAN_API_HEADERS, timeout=_TIMEOUT) as response:
                 return response.status == 200
         except Exception as e:
             _LOGGER.debug("API test failed: %s", e)
@@ -57,8 +72,62 @@ class NakdanAPI:
     def set_hass(self, hass: HomeAssistant) -> None:
         """Set Home Assistant instance reference."""
         self._hass = hass
+        # Home Assistant's shared session already pools keep-alive connections and caches DNS
+        self._session = async_get_clientsession(hass)
         _LOGGER.debug("Updated Home Assistant instance reference")
 
+    async def async_load_cache(self) -> None:
+        """Restore cache entries persisted by a previous run."""
+        if self._store is not None:
+            return  # Already loaded, e.g. when the config entry is reloaded
+
+        self._store = Store(self._hass, STORAGE_VERSION, STORAGE_KEY)
+        data = await self._store.async_load()
+        if not data:
+            return
+
+        # Timestamps are stored as wall-clock time, convert them back to the monotonic clock
+        offset = _now() - time.time()
+        oldest_valid = self._oldest_valid_timestamp()
+        for genre, text, result_obj, timestamp in data.get("entries", []):
+            timestamp += offset
+            # Entries may have expired while Home Assistant was down
+            if timestamp > oldest_valid:
+                self._cache[(genre, text)] = (result_obj, timestamp)
+        # The expiry queue must be in place before trimming, so expired entries go first
+        self._rebuild_expiry_queue()
+        self._trim_cache_to_size()
+
+        _LOGGER.debug("Restored %d cache entries from storage", len(self._cache))
+
+    async def async_remove_cache(self, hass: HomeAssistant) -> None:
+        """Clear the cache and delete its persisted copy."""
+        self._cache.clear()
+        self._expiry_queue.clear()
+        # The entry may never have been set up, so don't rely on self._hass here
+        store = self._store or Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._store = None
+        await store.async_remove()
+
+    def _schedule_save(self) -> None:
+        """Schedule a delayed write of the cache to storage."""
+        if self._store is not None:
+            self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+
+    def _data_to_save(self) -> Dict[str, Any]:
+        """Return the most recently used unexpired cache entries in a JSON serializable form, in LRU order."""
+        # Monotonic timestamps are meaningless after a restart, so store wall-clock time
+        offset = time.time() - _now()
+        oldest_valid = self._oldest_valid_timestamp()
+        # Only the newest entries are walked, so a large cache doesn't stall the event loop on save
+        entries = [
+            [genre, text, result_obj, timestamp + offset]
+            for (genre, text), (result_obj, timestamp) in islice(reversed(self._cache.items()), STORAGE_MAX_ENTRIES)
+            if timestamp > oldest_valid
+        ]
+        entries.reverse()
+        return {"entries": entries}
+
     def _get_config_entry(self) -> Optional[ConfigEntry]:
         """Get the first Nakdan config entry."""
         if not self._hass:
@@ -89,54 +158,66 @@ class NakdanAPI:
         """Get max cache size setting from config entry."""
         return self._get_config_value("max_cache_size", DEFAULT_MAX_CACHE_SIZE)
 
+    @property
+    def enable_batching(self) -> bool:
+        """Get request batching setting from config entry."""
+        return self._get_config_value("enable_batching", DEFAULT_ENABLE_BATCHING)
+
     def get_current_config(self) -> Dict[str, Any]:
         """Get current configuration."""
         return {
             "enable_cache_timeout": self.enable_cache_timeout,
             "cache_duration": self.cache_duration,
             "max_cache_size": self.max_cache_size,
+            "enable_batching": self.enable_batching,
             "cache_stats": self.get_cache_stats(),
         }
 
     async def _get_session(self) -> aiohttp.ClientSession:
         """Get aiohttp session."""
-        if self._hass:
-            return async_get_clientsession(self._hass)
+        if self._session:
+            return self._session
         else:
             raise HomeAssistantError("Home Assistant instance not available")
 
-    def _get_cache_key(self, text: str, genre: str) -> str:
-        """Generate cache key for the request."""
-        # Use SHA256 to avoid hash collisions
-        content = f"{genre}_{text}"
-        return hashlib.sha256(content.encode('utf-8')).hexdigest()
-
     def _is_cache_valid(self, timestamp: float) -> bool:
         """Check if cache entry is still valid."""
         if not self.enable_cache_timeout:
             return True  # Cache never expires if timeout is disabled
-        return time.time() - timestamp < self.cache_duration
+        return _now() - timestamp < self.cache_duration
+
+    def _oldest_valid_timestamp(self) -> float:
+        """Return the timestamp entries must be newer than to still be valid."""
+        if not self.enable_cache_timeout:
+            return float("-inf")
+        return _now() - self.cache_duration
 
-    def _cleanup_expired_cache(self) -> None:
+    def cleanup_expired_cache(self) -> None:
         """Remove expired entries from cache."""
         if not self.enable_cache_timeout:
             return  # No cleanup needed if timeout is disabled
 
-        current_time = time.time()
-        expired_keys = [
-            key for key, (_, timestamp) in self._cache.items()
-            if current_time - timestamp >= self.cache_duration
-        ]
-        for key in expired_keys:
-            del self._cache[key]
-
-        if expired_keys:
-            _LOGGER.debug("Cleaned up %d expired cache entries", len(expired_keys))
+        # Only the expired head of the expiry queue is visited, not the whole cache
+        current_time = _now()
+        cache_duration = self.cache_duration
+        removed = 0
+        while self._expiry_queue and current_time - self._expiry_queue[0][0] >= cache_duration:
+            timestamp, key = self._expiry_queue.popleft()
+            entry = self._cache.get(key)
+            # Skip records of entries that were evicted or replaced since
+            if entry is not None and entry[1] == timestamp:
+                del self._cache[key]
+                removed += 1
+
+        if removed:
+            _LOGGER.debug("Cleaned up %d expired cache entries", removed)
 
     def clear_cache(self) -> int:
         """Clear all cache entries and return count of cleared entries."""
         count = len(self._cache)
         self._cache.clear()
+        self._expiry_queue.clear()
+        self._schedule_save()
         _LOGGER.info("Cleared %d cache entries", count)
         return count
 
@@ -151,12 +232,17 @@ class NakdanAPI:
                 "cache_timeout_enabled": False,
             }
 
-        current_time = time.time()
-        valid_entries = sum(
-            1 for _, timestamp in self._cache.values()
-            if current_time - timestamp < self.cache_duration
-        )
-        expired_entries = len(self._cache) - valid_entries
+        # Expired entries are at the head of the expiry queue, so only those need to be visited
+        current_time = _now()
+        cache_duration = self.cache_duration
+        expired_entries = 0
+        for timestamp, key in self._expiry_queue:
+            if current_time - timestamp < cache_duration:
+                break
+            entry = self._cache.get(key)
+            if entry is not None and entry[1] == timestamp:
+                expired_entries += 1
+        valid_entries = len(self._cache) - expired_entries
 
         return {
             "total_entries": len(self._cache),
@@ -166,54 +252,60 @@ class NakdanAPI:
             "cache_timeout_enabled": True,
         }
 
+    def _rebuild_expiry_queue(self) -> None:
+        """Rebuild the expiry queue from the cache, dropping records of removed entries."""
+        self._expiry_queue = deque(sorted(
+            ((timestamp, key) for key, (_, timestamp) in self._cache.items()),
+            key=lambda item: item[0]
+        ))
+
     def _trim_cache_to_size(self) -> None:
-        """Trim cache to max size by removing oldest entries."""
-        if len(self._cache) <= self.max_cache_size:
+        """Trim cache to max size by evicting least recently used entries."""
+        max_cache_size = self.max_cache_size
+        if len(self._cache) <= max_cache_size:
             return
 
-        entries_to_remove = len(self._cache) - self.max_cache_size
-        oldest_keys = sorted(
-            self._cache.keys(),
-            key=lambda k: self._cache[k][1]
-        )[:entries_to_remove]
+        # Prefer dropping expired entries over evicting valid ones
+        if self.enable_cache_timeout:
+            self.cleanup_expired_cache()
+            if len(self._cache) <= max_cache_size:
+                return
 
-        for key in oldest_keys:
-            del self._cache[key]
+        entries_to_remove = len(self._cache) - max_cache_size
+        for _ in range(entries_to_remove):
+            self._cache.popitem(last=False)
 
         _LOGGER.debug("Trimmed cache: removed %d entries to fit max size %d",
-                     entries_to_remove, self.max_cache_size)
-
-    def _trim_cache_by_percentage(self, percentage: float) -> None:
-        # Remove percentage of cache or minimum 1 entry to make room
-        entries_to_remove = max(1, int(self.max_cache_size * percentage))
-        oldest_keys = sorted(
-            self._cache.keys(),
-            key=lambda k: self._cache[k][1]
-        )[:entries_to_remove]
-        for key in oldest_keys:
-            del self._cache[key]
-        _LOGGER.debug("Cache size limit reached, removed %d old entries (%d%% of max size)", len(oldest_keys), percentage * 100)
+                     entries_to_remove, max_cache_size)
 
     async def _make_request_with_retry(self, payload: dict, max_retries: int = DEFAULT_MAX_RETRIES) -> Optional[dict]:
         """Make service request with retry logic and exponential backoff."""
-        start_time = time.time()
+        start_time = _now()
+
+        # Encode with Home Assistant's orjson-backed encoder, once for all attempts
+        body = json_bytes(payload)
 
         for attempt in range(max_retries + 1):
             try:
                 session = await self._get_session()
-                timeout = aiohttp.ClientTimeout(total=DEFAULT_TIMEOUT)
 
-                async with session.post(NAKDAN_API_URL, json=payload, headers=NAKDAN_API_HEADERS, timeout=timeout) as response:
+                async with session.post(NAKDAN_API_URL, data=body, headers=NAKDAN_API_HEADERS, timeout=_TIMEOUT) as response:
                     if response.status == 200:
-                        result = await response.json()
+                        # Decode with Home Assistant's orjson-backed loader instead of stdlib json
+                        result = await response.json(loads=json_loads)
 
                         if attempt > 0:
                             _LOGGER.debug("Service request succeeded on attempt %d/%d", attempt + 1, max_retries + 1)
 
                         return {
                             "api_result": result,
-                            "response_time": time.time() - start_time,
+                            "response_time": _now() - start_time,
                         }
+                    elif 400 <= response.status < 500 and response.status not in (408, 429):
+                        # Client errors will fail the same way again, so don't retry them.
+                        # Request Timeout and Too Many Requests are worth retrying after the backoff.
+                        _LOGGER.error("Service request rejected with status %d", response.status)
+                        return None
                     else:
                         error_msg = f"Service request failed with status {response.status}"
                         _LOGGER.warning("%s (attempt %d/%d)", error_msg, attempt + 1, max_retries + 1)
@@ -238,73 +330,185 @@ class NakdanAPI:
     async def get_nikud(self, text: str, genre: str = "modern", max_retries: int = DEFAULT_MAX_RETRIES) -> Optional[Dict[str, Any]]:
         """Get nikud for Hebrew text with retry logic."""
 
-        # Validate genre
-        if genre not in GENRES:
+        # Validate genre, the per-genre payload templates double as a hashed lookup of GENRES
+        if genre not in _PAYLOAD_TEMPLATES:
             raise NakdanInvalidGenreError(f"Invalid genre: {genre}")
 
-        # Check cache
-        cache_key = self._get_cache_key(text, genre)
-        if cache_key in self._cache:
-            cached_data, timestamp = self._cache[cache_key]
+        # Nothing to send for empty text, and reject text over the documented limit
+        if not text:
+            return {"data": "", "response_time": 0.0}
+        if len(text) > MAX_TEXT_LENGTH:
+            raise NakdanError(f"Text too long (maximum {MAX_TEXT_LENGTH} characters)")
+
+        # Check cache. The dict hashes the key itself, and str caches its own hash,
+        # so keying on long texts is cheap enough for the event loop.
+        cache_key = (genre, text)
+        entry = self._cache.get(cache_key)
+        if entry is not None:
+            cached_data, timestamp = entry
             if self._is_cache_valid(timestamp):
-                _LOGGER.debug("Using cached result for: %s", text[:50])
+                # Mark as most recently used
+                self._cache.move_to_end(cache_key)
+                _LOGGER.debug("Using cached result for: %.50s", text)
                 return cached_data
             else:
                 # Remove expired entry
                 del self._cache[cache_key]
 
-        # Enforce cache size limit to prevent memory leaks
-        if len(self._cache) >= self.max_cache_size:
-            self._trim_cache_by_percentage(0.1)
+        # Join an identical request that is already in flight instead of sending another one
+        task = self._inflight.get(cache_key)
+        if task is None:
+            # The fetch runs in its own task, so cancelling the caller that started it
+            # doesn't cancel it for the other callers waiting on the same text
+            task = self._hass.async_create_task(self._fetch_nikud(text, genre, cache_key, max_retries))
+            self._inflight[cache_key] = task
+            task.add_done_callback(partial(self._inflight_done, cache_key))
+        else:
+            _LOGGER.debug("Waiting for in-flight request for: %.50s", text)
+
+        return await asyncio.shield(task)
+
+    def _inflight_done(self, cache_key: Tuple[str, str], task: asyncio.Task) -> None:
+        """Forget a finished in-flight request."""
+        del self._inflight[cache_key]
+        if not task.cancelled():
+            # Mark the exception as retrieved in case every caller was cancelled
+            task.exception()
 
-        # Periodically clean up expired entries (every 10th request) only if timeout is enabled
-        if self.enable_cache_timeout and len(self._cache) > 0 and len(self._cache) % 10 == 0:
-            self._cleanup_expired_cache()
+    async def _fetch_nikud(self, text: str, genre: str, cache_key: Tuple[str, str], max_retries: int) -> Optional[Dict[str, Any]]:
+        """Fetch nikud from the service and cache the result."""
+        if self.enable_batching:
+            result_obj = await self._request_nikud_batched(text, genre, max_retries)
+        else:
+            result_obj = await self._request_nikud(text, genre, max_retries)
+
+        if result_obj is None:
+            _LOGGER.error("Failed to get nikud for text: %.50s", text)
+            return None
+
+        # Cache the result, evicting least recently used entries to prevent memory leaks
+        timestamp = _now()
+        self._cache[cache_key] = (result_obj, timestamp)
+        self._expiry_queue.append((timestamp, cache_key))
+        self._trim_cache_to_size()
+
+        # Evicted and replaced entries leave stale records behind, compact once they dominate
+        if len(self._expiry_queue) > 2 * len(self._cache):
+            self._rebuild_expiry_queue()
+        self._schedule_save()
+
+        _LOGGER.debug("Successfully got nikud for: %.50s", text)
+        return result_obj
 
+    async def _request_nikud(self, text: str, genre: str, max_retries: int) -> Optional[Dict[str, Any]]:
+        """Request nikud for a single text from the service."""
         # Prepare service payload
-        payload = {
-            "task": "nakdan",
-            "data": text,
-            "genre": genre,
-            **NAKDAN_API_OPTIONS
-        }
+        payload = _PAYLOAD_TEMPLATES[genre].copy()
+        payload["data"] = text
 
         # Make service request with retry logic
         service_response = await self._make_request_with_retry(payload, max_retries)
 
         if service_response is None:
-            _LOGGER.error("Failed to get nikud for text: %s", text[:50])
             return None
 
-        # Build result object
-        result_obj = {
-            "data": self.build_nikud_text(service_response["api_result"]),
+        # A 200 with an unexpected body, e.g. {"error": ...}, won't get any better on retry
+        api_result = service_response["api_result"]
+        if not isinstance(api_result, list):
+            _LOGGER.error("Unexpected response from service: %.100s", api_result)
+            return None
+        try:
+            nikud_text = self.build_nikud_text(api_result)
+        except (AttributeError, KeyError, IndexError, TypeError) as err:
+            _LOGGER.error("Malformed response from service: %s", err)
+            return None
+
+        return {
+            "data": nikud_text,
             "response_time": service_response["response_time"],
         }
 
-        # Cache the result
-        self._cache[cache_key] = (result_obj, time.time())
+    async def _request_nikud_batched(self, text: str, genre: str, max_retries: int) -> Optional[Dict[str, Any]]:
+        """Queue a text to be sent along with other texts requested within the batch window."""
+        pending = self._pending.setdefault(genre, [])
 
-        _LOGGER.debug("Successfully got nikud for: %s", text[:50])
-        return result_obj
+        # Keep the combined text within the service limit by sending what is queued first
+        if pending and sum(len(queued) + 1 for queued, _, _ in pending) + len(text) > MAX_TEXT_LENGTH:
+            self._flush_batch(genre)
+            pending = self._pending.setdefault(genre, [])
+
+        if not pending:
+            self._hass.loop.call_later(BATCH_WINDOW, self._flush_batch, genre)
+
+        future = asyncio.get_running_loop().create_future()
+        pending.append((text, max_retries, future))
+        return await future
+
+    def _flush_batch(self, genre: str) -> None:
+        """Send the texts queued for a genre."""
+        batch = self._pending.pop(genre, None)
+        if batch:
+            self._hass.async_create_task(self._send_batch(genre, batch))
+
+    async def _send_batch(self, genre: str, batch: List[Tuple[str, int, asyncio.Future]]) -> None:
+        """Send a batch of texts in one request and resolve the waiting callers."""
+        try:
+            if len(batch) == 1:
+                text, max_retries, _ = batch[0]
+                results = [await self._request_nikud(text, genre, max_retries)]
+            else:
+                results = await self._request_nikud_many(genre, batch)
+        except Exception as err:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(err)
+            return
+
+        for (_, _, future), result_obj in zip(batch, results):
+            if not future.done():
+                future.set_result(result_obj)
+
+    async def _request_nikud_many(self, genre: str, batch: List[Tuple[str, int, asyncio.Future]]) -> List[Optional[Dict[str, Any]]]:
+        """Request nikud for several texts joined into one request."""
+        texts = [text for text, _, _ in batch]
+        max_retries = max(retries for _, retries, _ in batch)
+
+        result_obj = await self._request_nikud(BATCH_SEPARATOR.join(texts), genre, max_retries)
+        if result_obj is None:
+            return [None] * len(texts)
+
+        # Split the result back into one part per text, each text may contain separators of its own
+        lines = result_obj["data"].split(BATCH_SEPARATOR)
+        line_counts = [text.count(BATCH_SEPARATOR) + 1 for text in texts]
+        if len(lines) != sum(line_counts):
+            _LOGGER.debug("Could not split batched result, requesting %d texts separately", len(texts))
+            return await asyncio.gather(*(
+                self._request_nikud(text, genre, retries) for text, retries, _ in batch
+            ))
+
+        _LOGGER.debug("Got nikud for %d texts in one request", len(texts))
+        results = []
+        start = 0
+        for line_count in line_counts:
+            results.append({
+                "data": BATCH_SEPARATOR.join(lines[start:start + line_count]),
+                "response_time": result_obj["response_time"],
+            })
+            start += line_count
+        return results
 
     def build_nikud_text(self, service_response: List[Dict[str, Any]]) -> str:
         """Build nikud text from service response."""
         if not service_response:
             return ""
 
-        result_parts = []
+        # Separators (space, punctuation, etc.) are kept as-is, words take their first nikud option
+        # A list is joined faster than a generator, which str.join would turn into a list anyway
+        return "".join([
+            item.get("word", "") if item.get("sep") or not item.get("options")
+            else item["options"][0].replace("|", "")
+            for item in service_response
+        ])
 
-        for item in service_response:
-            if item.get("sep"):
-                # This is a separator (space, punctuation, etc.)
-                result_parts.append(item.get("word", ""))
-            else:
-                # This is a word with nikud options
-                options = item.get("options", [])
-                if options:
-                    result_parts.append(options[0].replace("|", ""))
-                else:
-                    result_parts.append(item.get("word", ""))
-
-        return "".join(result_parts)
\ No newline at end of file
+# Shared API client instance
+api = NakdanAPI()
\ No newline at end of file
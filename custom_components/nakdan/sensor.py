@@ -43,6 +43,7 @@ class NakdanSensor(SensorEntity):
         self._total_requests = 0
         self._failed_requests = 0
         self._cache_stats = {}
+        self._attr_extra_state_attributes = self._build_extra_state_attributes()
 
     @property
     def state(self) -> str:
@@ -64,9 +65,8 @@ class NakdanSensor(SensorEntity):
         """Get max cache size setting from config entry."""
         return self._config_entry.data.get("max_cache_size", DEFAULT_MAX_CACHE_SIZE)
 
-    @property
-    def extra_state_attributes(self) -> dict:
-        """Return additional state attributes."""
+    def _build_extra_state_attributes(self) -> dict:
+        """Build additional state attributes, only when the stats change."""
         attributes = {
             "last_text": self._last_text,
             "last_result": self._last_result,
@@ -92,23 +92,28 @@ class NakdanSensor(SensorEntity):
 
         return attributes
 
-    def update_stats(self, stats: dict = {}, count_requests: bool = True) -> None:
+    def update_stats(self, text: str = "", result: str | None = "", success: bool = True, cache_stats: dict | None = None, count_requests: bool = True) -> None:
         """Update sensor stats."""
         if count_requests:
             self._total_requests += 1
-        if not stats.get("success", True) and count_requests:
+        if not success and count_requests:
             self._failed_requests += 1
             self._state = "Error"
         else:
             self._state = "Ready"
 
-        self._last_text = stats.get("text", "")[:100]  # Truncate for display
-        self._last_result = stats.get("result", "")[:100]  # Truncate for display
+        # Truncate for display, short values (the common case) are kept as-is
+        self._last_text = text[:100] if text and len(text) > 100 else text
+        self._last_result = result[:100] if result and len(result) > 100 else result
+        # Kept as an ISO 8601 string, templates read attributes as raw Python objects
         self._last_update = datetime.now().isoformat()
 
         # Update cache stats if provided
-        if stats.get("cache_stats"):
-            self._cache_stats = stats.get("cache_stats")
+        if cache_stats:
+            self._cache_stats = cache_stats
+
+        # Replace the attributes in one go so readers never see a partial update
+        self._attr_extra_state_attributes = self._build_extra_state_attributes()
 
         # Schedule an update
         self.schedule_update_ha_state()
\ No newline at end of file
@@ -2,6 +2,7 @@
 import logging
 import voluptuous as vol
 from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError
 import homeassistant.helpers.config_validation as cv
 
 from .const import (
@@ -10,54 +11,69 @@ from .const import (
     SERVICE_CLEAR_CACHE,
     ATTR_TEXT,
     ATTR_ORIGINAL_TEXT,
+    ATTR_INCLUDE_ORIGINAL,
     ATTR_NIKUD_TEXT,
     ATTR_RESPONSE_TIME,
     ATTR_CACHE_STATS,
     GENRES,
     MAX_TEXT_LENGTH,
 )
-from .nakdan_api import NakdanAPI
+from .nakdan_api import api
 
 _LOGGER = logging.getLogger(__name__)
 
 SERVICE_GET_NIKUD_SCHEMA = vol.Schema({
     vol.Required(ATTR_TEXT): cv.string,
-    vol.Optional("genre", default="modern"): vol.In(GENRES),
+    vol.Optional("genre", default="modern"): vol.In(frozenset(GENRES)),
+    vol.Optional(ATTR_INCLUDE_ORIGINAL, default=True): cv.boolean,
 })
 
 SERVICE_CLEAR_CACHE_SCHEMA = vol.Schema({})
 
+# Error messages for rejected input, formatted once
+ERROR_TEXT_EMPTY = "Text cannot be empty"
+ERROR_TEXT_TOO_LONG = f"Text too long (maximum {MAX_TEXT_LENGTH} characters)"
+
 async def async_setup_services(hass: HomeAssistant) -> None:
     """Set up services for Nakdan integration."""
 
-    def _update_sensor_if_available(text: str, result: str | None = None, success: bool = True, cache_stats: dict | None = None, count_requests: bool = True):
+    # Resolved on first use. Services are registered again when the entry is reloaded,
+    # so this never outlives the sensor it refers to.
+    cached_sensor = None
+
+    def _update_sensor(text: str, result: str | None, success: bool, cache_stats: dict | None, count_requests: bool):
         """Update sensor stats if sensor is available."""
+        nonlocal cached_sensor
         try:
-            sensor = hass.data.get(DOMAIN, {}).get("sensor")
-            if sensor and hasattr(sensor, 'update_stats'):
-                sensor.update_stats({
-                    "text": text,
-                    "result": result,
-                    "success": success,
-                    "cache_stats": cache_stats,
-                }, count_requests)
-            else:
-                _LOGGER.debug("Sensor not available for stats update")
+            sensor = cached_sensor
+            if sensor is None:
+                sensor = hass.data.get(DOMAIN, {}).get("sensor")
+                if not (sensor and hasattr(sensor, 'update_stats')):
+                    _LOGGER.debug("Sensor not available for stats update")
+                    return
+                cached_sensor = sensor
+
+            sensor.update_stats(text, result, success, cache_stats, count_requests)
         except Exception as err:
+            # Resolve the sensor again next time in case it was replaced
+            cached_sensor = None
             _LOGGER.warning("Failed to update sensor stats: %s", err)
 
+    def _update_sensor_if_available(text: str, result: str | None = None, success: bool = True, cache_stats: dict | None = None, count_requests: bool = True):
+        """Schedule a sensor stats update without holding up the service response."""
+        hass.loop.call_soon(_update_sensor, text, result, success, cache_stats, count_requests)
+
     async def handle_get_nikud(call: ServiceCall) -> ServiceResponse:
         """Handle the get_nikud service call."""
         text = call.data[ATTR_TEXT]
         genre = call.data.get("genre", "modern")
 
-        # Get the singleton API client
-        api = NakdanAPI()
-
-        if not text or not text.strip():
-            return {"success": False, "error": "Text cannot be empty"}
+        # Length first, it is O(1) and rejects oversized input before any scan of it.
+        # isspace() stops at the first non-space character and, unlike strip(), copies nothing
         if len(text) > MAX_TEXT_LENGTH:
-            return {"success": False, "error": f"Text too long (maximum {MAX_TEXT_LENGTH} characters)"}
+            return {"success": False, "error": ERROR_TEXT_TOO_LONG}
+        if not text or text.isspace():
+            return {"success": False, "error": ERROR_TEXT_EMPTY}
 
         try:
             # Call the service
@@ -73,22 +89,28 @@ async def async_setup_services(hass: HomeAssistant) -> None:
                 }
 
             nikud_text = result.get("data", "")
+            cache_stats = api.get_cache_stats()
 
             # Update sensor with success
-            _update_sensor_if_available(text, nikud_text, True, api.get_cache_stats())
+            _update_sensor_if_available(text, nikud_text, True, cache_stats)
 
             response_data = {
                 "success": True,
-                ATTR_ORIGINAL_TEXT: text,
                 ATTR_NIKUD_TEXT: nikud_text,
                 ATTR_RESPONSE_TIME: result.get("response_time", 0),
-                ATTR_CACHE_STATS: api.get_cache_stats(),
+                ATTR_CACHE_STATS: cache_stats,
             }
+            # Echoing the input back doubles the response size for long texts, callers can opt out
+            if call.data.get(ATTR_INCLUDE_ORIGINAL, True):
+                response_data[ATTR_ORIGINAL_TEXT] = text
 
-            _LOGGER.debug("Successfully processed nikud for text: %s", text[:50])
+            _LOGGER.debug("Successfully processed nikud for text: %.50s", text)
             return response_data
 
-        except Exception as err:
+        # Network failures, a missing session and malformed responses are all reported
+        # as None by the API, so only NakdanError (invalid genre or text too long) is
+        # expected here; anything else is a bug
+        except HomeAssistantError as err:
             # Update sensor with failure
             _update_sensor_if_available(text, None, False, api.get_cache_stats())
 
@@ -100,9 +122,6 @@ async def async_setup_services(hass: HomeAssistant) -> None:
 
     async def handle_clear_cache(call: ServiceCall) -> ServiceResponse:
         """Handle the clear_cache service call."""
-        # Get the singleton API client
-        api = NakdanAPI()
-
         try:
             # Get cache stats before clearing
             cache_stats_before = api.get_cache_stats()